@@ -16,120 +16,88 @@ class PluginModel2544(BaseModel):  # Main Model
     ports_configuration: PortConfType
     test_types_configuration: TestTypesConfiguration
 
-    def set_ports_rx_tx_type(self) -> None:
-        direction = self.test_configuration.topology_config.direction
-        for port_config in self.ports_configuration:
-            if port_config.is_loop:
-                continue
-            elif direction == const.TrafficDirection.EAST_TO_WEST:
-                if port_config.port_group.is_east:
-                    port_config.set_rx_port(False)
-                elif port_config.port_group.is_west:
-                    port_config.set_tx_port(False)
-            elif direction == const.TrafficDirection.WEST_TO_EAST:
-                if port_config.port_group.is_east:
-                    port_config.set_tx_port(False)
-                elif port_config.port_group.is_west:
-                    port_config.set_rx_port(False)
-
-    def set_profile(self) -> None:
-        for port_config in self.ports_configuration:
-            profile_id = port_config.protocol_segment_profile_id
-            profile = [i for i in self.protocol_segments if i.id == profile_id][0]
-            port_config.set_profile(profile.copy(deep=True))
-
-    def __init__(self, **data: Dict[str, Any]) -> None:
-        super().__init__(**data)
-        self.set_ports_rx_tx_type()
-
-        self.check_port_groups_and_peers()
-        self.set_profile()
-
-    @validator("ports_configuration", always=True)
-    def check_ip_properties(cls, v: "PortConfType", values) -> "PortConfType":
-        pro_map = {v.id: v.protocol_version for v in values['protocol_segments']}
-        for i, port_config in enumerate(v):
-            if port_config.protocol_segment_profile_id not in pro_map:
-                raise exceptions.PSPMissing()
-            if (
-                pro_map[port_config.protocol_segment_profile_id].is_l3
-                and (not port_config.ip_address or port_config.ip_address.address.is_empty)
-            ):
-                raise exceptions.IPAddressMissing()
-        return v
-
-    @validator("ports_configuration", always=True)
-    def check_port_count(
-        cls, v: "PortConfType", values: Dict[str, Any]
-    ) -> "PortConfType":
-        require_ports = 2
-        if "test_configuration" in values:
-            topology: const.TestTopology = values[
-                "test_configuration"
-            ].topology_config.topology
-            if topology.is_pair_topology:
-                require_ports = 1
-            if len(v) < require_ports:
-                raise exceptions.PortConfigNotEnough(require_ports)
-        return v
-
-    def check_port_groups_and_peers(self) -> None:
+    @staticmethod
+    def set_port_rx_tx_type(
+        port_config: "PortConfiguration", direction: "const.TrafficDirection"
+    ) -> None:
+        if port_config.is_loop:
+            return
+        elif direction == const.TrafficDirection.EAST_TO_WEST:
+            if port_config.port_group.is_east:
+                port_config.set_rx_port(False)
+            elif port_config.port_group.is_west:
+                port_config.set_tx_port(False)
+        elif direction == const.TrafficDirection.WEST_TO_EAST:
+            if port_config.port_group.is_east:
+                port_config.set_tx_port(False)
+            elif port_config.port_group.is_west:
+                port_config.set_rx_port(False)
+
+    def resolve_ports(self) -> None:
+        """
+        set rx/tx type and profile of every port in a single pass,
+        port groups and peers are checked in the same pass.
+        """
         topology = self.test_configuration.topology_config.topology
+        direction = self.test_configuration.topology_config.direction
+        check_groups = not topology.is_mesh_topology
+        check_peers = topology.is_pair_topology
         ports_in_east = ports_in_west = 0
-        uses_port_peer = topology.is_pair_topology
+        profiles: Dict[str, "ProtocolSegmentProfileConfig"] = {}
+        for profile in self.protocol_segments:
+            profiles.setdefault(profile.id, profile)
         for port_config in self.ports_configuration:
-            if not topology.is_mesh_topology:
+            self.set_port_rx_tx_type(port_config, direction)
+            profile = profiles[port_config.protocol_segment_profile_id]
+            port_config.set_profile(profile.copy(deep=True))
+            if check_groups:
                 ports_in_east, ports_in_west = self.count_port_group(
-                    port_config, uses_port_peer, ports_in_east, ports_in_west
+                    port_config, check_peers, ports_in_east, ports_in_west
                 )
-            if uses_port_peer:
+            if check_peers:
                 self.check_port_peer(port_config, self.ports_configuration)
-        if not topology.is_mesh_topology:
+        if check_groups:
             for i, group in (ports_in_east, "East"), (ports_in_west, "West"):
                 if not i:
                     raise exceptions.PortGroupError(group)
 
+    def __init__(self, **data: Dict[str, Any]) -> None:
+        super().__init__(**data)
+        self.resolve_ports()
+
     @validator("ports_configuration", always=True)
-    def check_modifier_mode_and_segments(
+    def check_ports_configuration(
         cls, v: "PortConfType", values: Dict[str, Any]
     ) -> "PortConfType":
-        if "test_configuration" in values:
-            flow_creation_type = values[
-                "test_configuration"
-            ].test_execution_config.flow_creation_config.flow_creation_type
+        """ per port checks share a single traversal, the port count is checked after it """
+        pro_map = {
+            p.id: p.protocol_version for p in values.get("protocol_segments", [])
+        }
+        test_conf = values.get("test_configuration")
+        topology = test_conf.topology_config.topology if test_conf else None
+        if "protocol_segments" in values:
             for port_config in v:
-                if (
-                    not flow_creation_type.is_stream_based
-                ) and port_config.profile.protocol_version.is_l3:
-                    raise exceptions.ModifierBasedNotSupportL3()
-        return v
-
-    @validator("ports_configuration", always=True)
-    def check_port_group(
-        cls, v: "PortConfiguration", values: Dict[str, Any]
-    ) -> "PortConfiguration":
-        if "ports_configuration" in values and "test_configuration" in values:
-            for k, p in values["ports_configuration"].items():
-                if (
-                    p.port_group == const.PortGroup.UNDEFINED
-                    and not values[
-                        "test_configuration"
-                    ].topology_config.topology.is_mesh_topology
+                if port_config.protocol_segment_profile_id not in pro_map:
+                    raise exceptions.PSPMissing()
+                if pro_map[port_config.protocol_segment_profile_id].is_l3 and (
+                    not port_config.ip_address or port_config.ip_address.address.is_empty
                 ):
-                    raise exceptions.PortGroupNeeded()
+                    raise exceptions.IPAddressMissing()
+        if topology is not None:
+            require_ports = 1 if topology.is_pair_topology else 2
+            if len(v) < require_ports:
+                raise exceptions.PortConfigNotEnough(require_ports)
         return v
 
     @validator("test_types_configuration", always=True)
     def check_test_type_enable(
         cls, v: "TestTypesConfiguration"
     ) -> "TestTypesConfiguration":
-        if not any(
-            {
-                v.throughput_test.enabled,
-                v.latency_test.enabled,
-                v.frame_loss_rate_test.enabled,
-                v.back_to_back_test.enabled,
-            }
+        if not (
+            v.throughput_test.enabled
+            or v.latency_test.enabled
+            or v.frame_loss_rate_test.enabled
+            or v.back_to_back_test.enabled
         ):
             raise exceptions.TestTypesError()
         return v
@@ -1,7 +1,6 @@
 from ipaddress import (
     IPv4Network,
     IPv6Network,
-    ip_network,
     ip_address,
     IPv4Address as OriginIPv4Address,
     IPv6Address as OriginIPv6Address,
@@ -24,7 +23,7 @@ class IPAddressProperties(BaseModel):
 
     @property
     def network(self) -> Union["IPv4Network", "IPv6Network"]:
-        return ip_network(f"{self.address}/{self.routing_prefix}", strict=False)
+        return self.address.network(self.routing_prefix)
 
     @validator(
         "address",
@@ -37,11 +36,14 @@ class IPAddressProperties(BaseModel):
     def set_address(
         cls, origin_addr: Union[str, "IPv4Address", "IPv6Address"]
     ) -> Union["IPv4Address", "IPv6Address"]:
+        if isinstance(origin_addr, (IPv4Address, IPv6Address)):
+            return origin_addr
         address = ip_address(origin_addr)
+        # rebuild from the integer, passing the address object would format and parse it again
         return (
-            IPv4Address(address)
+            IPv4Address(int(address))
             if isinstance(address, OriginIPv4Address)
-            else IPv6Address(address)
+            else IPv6Address(int(address))
         )
 
     @validator("routing_prefix", "public_routing_prefix", pre=True, allow_reuse=True)
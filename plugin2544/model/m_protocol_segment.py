@@ -1,12 +1,16 @@
 import re
+import struct
 from enum import Enum
 from random import randint
-from typing import Any, Callable, Dict, Generator, List, Optional
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from pydantic.class_validators import validator
 from xoa_driver.enums import ProtocolOption, ModifierAction
 from ..utils.exceptions import ModifierRangeError
 
+_BINARY_STRING = re.compile("[01]+")
+
+
 class BinaryString(str):
     @classmethod
     def __get_validators__(cls) -> Generator[Callable, None, None]:
@@ -14,13 +18,14 @@ class BinaryString(str):
 
     @classmethod
     def validate(cls, v: str) -> "BinaryString":
-        if not re.search("^[01]+$", v):
+        if not _BINARY_STRING.fullmatch(v):
             raise ValueError("binary string must zero or one")
         return cls(v)
 
     @property
     def is_all_zero(self) -> bool:
-        return bool(re.search("^[0]+$", self))
+        # validated to only hold zeros and ones, so no need of a regex here
+        return bool(self) and "1" not in self
 
 
 class ModifierActionOption(Enum):
@@ -37,17 +42,23 @@ class PortProtocolVersion(Enum):
     IPV4 = 4
     IPV6 = 6
 
+    def __init__(self, value: int) -> None:
+        # members are singletons, so resolve the flags once at class creation
+        self._is_ipv4 = value == 4
+        self._is_ipv6 = value == 6
+        self._is_l3 = value != 0
+
     @property
     def is_ipv4(self) -> bool:
-        return self == type(self).IPV4
+        return self._is_ipv4
 
     @property
     def is_ipv6(self) -> bool:
-        return self == type(self).IPV6
+        return self._is_ipv6
 
     @property
     def is_l3(self) -> bool:
-        return self != type(self).ETHERNET
+        return self._is_l3
 
 
 class SegmentType(Enum):
@@ -89,15 +100,19 @@ class SegmentType(Enum):
     for i in range(1, 65):
         SegmentType[f"RAW_{i}"] = f"raw_{i}"  # type: ignore
 
+    def __init__(self, value: str) -> None:
+        # members are singletons, so parse the raw length once at class creation
+        self._raw_length = (
+            int(value.split("_")[-1]) if value.lower().startswith("raw") else 0
+        )
+
     @property
     def is_raw(self) -> bool:
-        return self.value.lower().startswith("raw")
+        return self._raw_length > 0
 
     @property
     def raw_length(self) -> int:
-        if not self.is_raw:
-            return 0
-        return int(self.value.split("_")[-1])
+        return self._raw_length
 
     def to_xmp(self) -> "ProtocolOption":
         return ProtocolOption[self.name]
@@ -188,12 +203,28 @@ class SegmentField(BaseModel):
     bit_length: int
     hw_modifier: Optional[HWModifier]
     value_range: Optional[ValueRange]
+    _int_value: int = 0  # value parsed once, kept in step by set_field_value
+    _mask: int = 0  # all ones of bit_length
 
     class Config:
+        underscore_attrs_are_private = True
         validate_assignment = True
+        # use already built instances as they are when nested, no copy
+        copy_on_model_validation = "none"
+
+    @validator("bit_length")
+    def check_value_length(cls, v: int, values: Dict[str, Any]) -> int:
+        # a wider value would be packed into the bits of the neighbour fields
+        if "value" in values and len(values["value"]) > v:
+            raise ValueError(
+                f"value length {len(values['value'])} exceeds field length {v}"
+            )
+        return v
 
     def __init__(self, **data: Dict[str, Any]) -> None:
         super().__init__(**data)
+        self._int_value = int(self.value, 2)
+        self._mask = (1 << self.bit_length) - 1
         self.check_value_range()
 
     def check_value_range(self) -> None:
@@ -204,14 +235,12 @@ class SegmentField(BaseModel):
         if max_val >= theory_max:  # why not fvr.stop_value >= can_max?
             raise Exception("invalid value range", self.name, theory_max)
 
-    def prepare(self) -> "BinaryString":
+    def prepare(self) -> int:
+        """ field value as an integer of bit_length bits """
         if not self.value_range:
-            return self.value
-
-        value_range_str = bin(self.value_range.get_current_value())[2:].zfill(
-            self.bit_length
-        )
-        return BinaryString(value_range_str)
+            return self._int_value
+        # keep the value inside the field bits, so it can't spill into the neighbours
+        return self.value_range.get_current_value() & self._mask
 
     def set_field_value(self, new_value: "BinaryString") -> None:
         if len(new_value) != self.bit_length:
@@ -219,6 +248,7 @@ class SegmentField(BaseModel):
                 f"new value length {len(new_value)} not match field length {self.bit_length} ({self.name})"
             )
         self.value = new_value
+        self._int_value = int(self.value, 2)
 
     @property
     def is_all_zero(self) -> bool:
@@ -228,10 +258,33 @@ class SegmentField(BaseModel):
 class ProtocolSegment(BaseModel):
     type: SegmentType
     fields: List[SegmentField]
-    checksum_offset: Optional[int]
+    checksum_offset: Optional[int] = Field(None, ge=0)
+    # indices instead of field references, so the lookup stays valid on copy(deep=True)
+    _field_indices: Dict[str, int] = {}
+    _value_range_shifts: List[Tuple[int, int]] = []  # (field index, bit shift)
+    _byte_length: int = 0
+    # static fields packed once, dropped by __setitem__
+    _template: Optional[int] = None
+    _static_result: Optional[bytearray] = None
+
+    class Config:
+        underscore_attrs_are_private = True
+        copy_on_model_validation = "none"
 
     def __init__(self, **data: Dict[str, Any]) -> None:
         super().__init__(**data)
+        field_indices: Dict[str, int] = {}
+        for index, field in enumerate(self.fields):
+            field_indices.setdefault(field.name, index)
+        self._field_indices = field_indices
+        shift = bit_length = self.bit_length
+        value_range_shifts = []
+        for index, field in enumerate(self.fields):
+            shift -= field.bit_length
+            if field.value_range:
+                value_range_shifts.append((index, shift))
+        self._value_range_shifts = value_range_shifts
+        self._byte_length = (bit_length + 7) // 8
 
     @property
     def hw_modifiers(self) -> Generator["HWModifier", None, None]:
@@ -241,44 +294,52 @@ class ProtocolSegment(BaseModel):
     def value_ranges(self) -> Generator["ValueRange", None, None]:
         return (f.value_range for f in self.fields if f.value_range)
 
-    @validator("checksum_offset")
-    def is_digit(cls, value: int) -> int:
-        if value and not isinstance(value, int):
-            raise ValueError("checksum offset must digit")
-        return value
-
     def __wrap_add_16(self, data: bytearray, offset_num: int) -> bytearray:
-        checksum = 0
         data[offset_num + 0] = 0
         data[offset_num + 1] = 0
-        for i in range(0, len(data), 2):
-            w = (data[i + 0] << 8) + data[i + 1]
-            checksum += w
-            if checksum > 0xFFFF:
-                checksum = (1 + checksum) & 0xFFFF  # add carry back in as lsb
-        data[offset_num + 0] = 0xFF + 1 + (~(checksum >> 8))
-        data[offset_num + 1] = 0xFF + 1 + (~(checksum & 0xFF))
+        # unpack and sum all 16-bit big-endian words in C instead of looping byte by byte
+        checksum = sum(struct.unpack_from(f">{len(data) // 2}H", data))
+        if len(data) % 2:
+            checksum += data[-1] << 8
+        while checksum > 0xFFFF:
+            checksum = (checksum & 0xFFFF) + (checksum >> 16)  # add carry back in as lsb
+        checksum = ~checksum & 0xFFFF
+        data[offset_num + 0] = checksum >> 8
+        data[offset_num + 1] = checksum & 0xFF
         return data
 
-    def prepare(self) -> bytearray:
-        result = ""
+    def __pack_template(self) -> int:
+        # pack the fields into one integer by bit shifting, value range fields left as zero
+        value = 0
         for f in self.fields:
-            field_binary_string = f.prepare()
-            result += field_binary_string
-        result = int(result, 2).to_bytes((len(result) + 7) // 8, byteorder="big")
-        result = bytearray(result)
+            value = (value << f.bit_length) | (0 if f.value_range else f.prepare())
+        return value
+
+    def __to_bytes(self, value: int) -> bytearray:
+        result = bytearray(value.to_bytes(self._byte_length, byteorder="big"))
         if self.checksum_offset:
             result = self.__wrap_add_16(result, self.checksum_offset)
         return result
 
+    def prepare(self) -> bytearray:
+        if self._template is None:
+            self._template = self.__pack_template()
+        if not self._value_range_shifts:
+            if self._static_result is None:
+                self._static_result = self.__to_bytes(self._template)
+            return bytearray(self._static_result)
+        value = self._template
+        for index, shift in self._value_range_shifts:
+            value |= self.fields[index].prepare() << shift
+        return self.__to_bytes(value)
+
     def __getitem__(self, field_name: str) -> "SegmentField":
-        for field in self.fields:
-            if field.name == field_name:
-                return field
-        raise KeyError(field_name)
+        return self.fields[self._field_indices[field_name]]
 
     def __setitem__(self, field_name: str, new_value: "BinaryString") -> None:
         self[field_name].set_field_value(new_value)
+        self._template = None
+        self._static_result = None
 
     @property
     def bit_length(self) -> int:
@@ -292,13 +353,17 @@ class ProtocolSegment(BaseModel):
 class ProtocolSegmentProfileConfig(BaseModel):
     id: str = ""  
     segments: List[ProtocolSegment] = []
+    _segment_indices: Dict[SegmentType, List[int]] = {}
+    # segments are fixed after construction, so these are computed once in __init__
+    _protocol_version: PortProtocolVersion = PortProtocolVersion.ETHERNET
+    _packet_header_length: int = 0
+    _modifier_count: int = 0
+
+    class Config:
+        underscore_attrs_are_private = True
 
     def __getitem__(self, segment_type: "SegmentType") -> List["ProtocolSegment"]:
-        return [
-            segment
-            for segment in self.segments
-            if segment.type == segment_type
-        ]
+        return [self.segments[i] for i in self._segment_indices.get(segment_type, ())]
 
     def prepare(self) -> bytearray:
         result = bytearray()
@@ -313,6 +378,9 @@ class ProtocolSegmentProfileConfig(BaseModel):
 
     @property
     def protocol_version(self) -> "PortProtocolVersion":
+        return self._protocol_version
+
+    def calc_protocol_version(self) -> "PortProtocolVersion":
         v = PortProtocolVersion.ETHERNET
         for i in self.segments:
             if i.type == SegmentType.IPV6:
@@ -330,11 +398,11 @@ class ProtocolSegmentProfileConfig(BaseModel):
     @property
     def packet_header_length(self) -> int:
         """byte header length for convenient use with xoa-driver"""
-        return sum(hs.bit_length for hs in self.segments) // 8
+        return self._packet_header_length
 
     @property
     def modifier_count(self) -> int:
-        return sum(hs.modifier_count for hs in self.segments)
+        return self._modifier_count
 
     def calc_segment_position(self) -> None:
         total_bit_length = 0
@@ -349,3 +417,10 @@ class ProtocolSegmentProfileConfig(BaseModel):
     def __init__(self, **data: Dict[str, Any]) -> None:
         super().__init__(**data)
         self.calc_segment_position()
+        segment_indices: Dict[SegmentType, List[int]] = {}
+        for index, segment in enumerate(self.segments):
+            segment_indices.setdefault(segment.type, []).append(index)
+        self._segment_indices = segment_indices
+        self._protocol_version = self.calc_protocol_version()
+        self._packet_header_length = sum(hs.bit_length for hs in self.segments) // 8
+        self._modifier_count = sum(hs.modifier_count for hs in self.segments)
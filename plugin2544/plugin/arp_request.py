@@ -32,14 +32,11 @@ async def set_arp_request(
     """
     ip_properties = port_struct.port_conf.ip_address
     peer_ip_properties = peer_struct.port_conf.ip_address
-    if any(
-        (
-            not use_gateway_mac_as_dmac,
-            ip_properties
-            and ip_properties.gateway.is_empty,
-            not port_struct.port_conf.profile.protocol_version.is_l3,
-            is_same_ipnetwork(port_struct, peer_struct),
-        )
+    if (
+        not use_gateway_mac_as_dmac
+        or (ip_properties and ip_properties.gateway.is_empty)
+        or not port_struct.port_conf.profile.protocol_version.is_l3
+        or is_same_ipnetwork(port_struct, peer_struct)
     ):
         # return an empty Macaddress if no arp mac
         # If the network addresses of two IP addresses are the same, then these two IP addresses are in the same network
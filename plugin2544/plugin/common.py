@@ -1,4 +1,4 @@
-import re
+from functools import lru_cache
 from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 from ..utils import constants as const, field
 
@@ -8,9 +8,11 @@ if TYPE_CHECKING:
     from ..model.m_port_config import PortConfiguration
 
 
+@lru_cache(maxsize=4096)
 def gen_macaddress(first_three_bytes: str, index: int) -> "field.MacAddress":
-    hex_num = hex(index)[2:].zfill(6)
-    last_three_bytes = "".join(re.findall(r".{2}", hex_num))
+    # the same few (base, index) pairs are asked for every port and stream, MacAddress is immutable
+    hex_num = f"{index:06x}"
+    last_three_bytes = hex_num[: len(hex_num) // 2 * 2]  # whole bytes only
     return field.MacAddress(f"{first_three_bytes}:{last_three_bytes}")
 
 
@@ -136,7 +136,7 @@ def count_source_port(
 ) -> int:
     count = 0
     for port_struct in control_ports:
-        if peer_struct in port_struct.properties.peers:
+        if port_struct.properties.has_peer(peer_struct):
             count += 1
     return count
 
@@ -272,22 +272,19 @@ def check_test_config(
     )
 
 
-def check_tester_sync_start(
-    tester: "xoa_testers.L23Tester", use_sync_start: bool
-) -> None:
-    if not use_sync_start:
-        return
+def check_tester_sync_start(tester: "xoa_testers.L23Tester") -> None:
     cap = tester.info.capabilities
-    if cap and not bool(cap.can_sync_traffic_start):
+    if cap and not cap.can_sync_traffic_start:
         raise exceptions.PortStaggeringNotSupport()
 
 
 def check_testers(
     testers: List["xoa_testers.L23Tester"], test_conf: "TestConfigData"
 ) -> None:
-    use_port_sync_start = test_conf.use_port_sync_start
+    if not test_conf.use_port_sync_start:
+        return
     for tester in testers:
-        check_tester_sync_start(tester, use_port_sync_start)
+        check_tester_sync_start(tester)
 
 
 def check_test_type_config(test_type_conf: List["AllTestTypeConfig"]):
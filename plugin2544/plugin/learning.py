@@ -146,11 +146,13 @@ async def setup_address_refresh(
             for packet in packet_list:
                 address_refresh_tokens.append(
                     (
-                        port_struct.port_ins.tx_single_pkt.send.set(packet),
+                        port_struct.send_packet(packet),
                         port_struct.port_conf.is_rx_only,
                     )
                 )
-        await port_struct.set_rx_tables()
+    await asyncio.gather(
+        *[port_struct.set_rx_tables() for port_struct in resources.port_structs]
+    )
     return address_refresh_tokens
 
 
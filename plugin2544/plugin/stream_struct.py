@@ -203,11 +203,11 @@ class StreamStruct:
             return
         if self._stream_offset and self._addr_coll.dst_addr:
             if self._tx_port.protocol_version.is_ipv4:
-                self.rx_port.properties.arp_trunks.add(
+                self.rx_port.properties.add_arp(
                     RXTableData(self._addr_coll.dst_addr, self._addr_coll.dmac)
                 )
             elif self._tx_port.protocol_version.is_ipv6:
-                self.rx_port.properties.ndp_trunks.add(
+                self.rx_port.properties.add_ndp(
                     RXTableData(self._addr_coll.dst_addr, self._addr_coll.dmac)
                 )
             add_address_refresh_entry(
@@ -1,5 +1,17 @@
 import asyncio
-from typing import List, TYPE_CHECKING, Optional, Set, Tuple, Union
+from bisect import bisect_left
+from functools import partial
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    TYPE_CHECKING,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from dataclasses import dataclass, field
 from xoa_driver import enums, misc, utils as driver_utils
 from .common import gen_macaddress
@@ -29,7 +41,68 @@ if TYPE_CHECKING:
     )
 
 
+_ON = enums.OnOff.ON
+_OFF = enums.OnOff.OFF
+_NO = enums.YesNo.NO
+_NORMAL_TPLD = enums.TPLDMode.NORMAL
+_MICRO_TPLD = enums.TPLDMode.MICRO
+
+
+class PortSetupBatch:
+    """
+    collect the commands of one port across setup phases and send them with as few requests as possible.
+    commands keep their order and are sent in requests of at most 200 commands.
+    """
+
+    __slots__ = ("_tokens",)
+
+    def __init__(self) -> None:
+        self._tokens: List["misc.Token"] = []
+
+    def add(self, tokens: "SetupTokens") -> None:
+        if isinstance(tokens, list):
+            self._tokens.extend(tokens)
+        elif tokens is not None:
+            self._tokens.append(tokens)
+
+    async def flush(self) -> None:
+        tokens, self._tokens = self._tokens, []
+        # driver_utils.apply accepts at most 200 commands per request
+        for start in range(0, len(tokens), 200):
+            await driver_utils.apply(*tokens[start : start + 200])
+
+
 class PortStruct:
+    # one instance per test port, kept for the whole test
+    __slots__ = (
+        "_tester",
+        "port_ins",
+        "_xoa_out",
+        "_port_identity",
+        "_should_stop_on_los",
+        "_port_conf",
+        "properties",
+        "lock",
+        "_traffic_stopped",
+        "_stream_structs",
+        "_statistic",
+        "stop",
+        "_send_packet",
+        "_set_traffic_state",
+        "_get_traffic_state",
+        "_get_rx_extra",
+        "_clear_tx_statistics",
+        "_clear_rx_statistics",
+        "_capabilities",
+        "_can_brr_mode",
+        "_can_mdi_mdix",
+        "_can_auto_neg_base_r",
+        "_can_set_link_train",
+        "_can_set_autoneg",
+        "_setup_plan_head",
+        "_setup_plan_tail",
+    )
+
     def __init__(
         self,
         tester: "xoa_testers.L23Tester",
@@ -46,9 +119,56 @@ class PortStruct:
         self._port_conf = port_conf
         self.properties = Properties()
         self.lock = asyncio.Lock()
+        self._traffic_stopped = asyncio.Event()
         self._stream_structs: List["StreamStruct"] = []
         self._statistic = PortStatistic()  # reset every second
         self.stop = False
+        # bound command methods used repeatedly during the test, resolved once
+        self._send_packet = port.tx_single_pkt.send.set
+        self._set_traffic_state = port.traffic.state.set
+        self._get_traffic_state = port.traffic.state.get
+        self._get_rx_extra = port.statistics.rx.extra.get
+        self._clear_tx_statistics = port.statistics.tx.clear.set
+        self._clear_rx_statistics = port.statistics.rx.clear.set
+        self._snapshot_capabilities()
+        self._setup_plan_head, self._setup_plan_tail = self._build_setup_plan()
+
+    def _build_setup_plan(self) -> Tuple[List["SetupStep"], List["SetupStep"]]:
+        """
+        the port config is fixed for the whole test, so decide once which setup commands it needs.
+        the plan is split where setup_port inserts the latency mode, to keep the command order.
+        """
+        conf = self._port_conf
+        head: List["SetupStep"] = [
+            partial(self.set_speed_mode, conf.port_speed_mode),
+            partial(self.set_latency_offset, conf.latency_offset_ms),
+            partial(self.set_interframe_gap, int(conf.inter_frame_gap)),
+            partial(self.set_pause_mode, conf.pause_mode_enabled),
+        ]
+        tail: List["SetupStep"] = [self.set_reply]
+        if conf.ip_address:
+            tail.append(self.set_ip_address)
+        tail.append(partial(self.set_broadr_reach_mode, conf.broadr_reach_mode))
+        tail.append(partial(self.set_mdi_mdix_mode, conf.mdi_mdix_mode))
+        if conf.fec_mode != const.FECModeStr.OFF:
+            tail.append(partial(self.set_fec_mode, conf.fec_mode))
+        if conf.anlt_enabled:
+            tail.append(partial(self.set_anlt, True))
+        if conf.auto_neg_enabled:
+            tail.append(partial(self.set_auto_negotiation, True))
+        tail.append(partial(self.set_max_header, conf.profile.packet_header_length))
+        tail.append(partial(self.set_sweep_reduction, conf.speed_reduction_ppm))
+        return head, tail
+
+    def _snapshot_capabilities(self) -> None:
+        """ read the capability flags used by the setup commands once, instead of per command """
+        info = self.port_ins.info
+        self._capabilities = capabilities = info.capabilities
+        self._can_brr_mode = info.is_brr_mode_supported != _NO
+        self._can_mdi_mdix = capabilities.can_mdi_mdix != _NO
+        self._can_auto_neg_base_r = bool(capabilities.can_auto_neg_base_r)
+        self._can_set_link_train = bool(capabilities.can_set_link_train)
+        self._can_set_autoneg = bool(capabilities.can_set_autoneg)
 
     def set_should_stop_on_los(self, value: bool) -> None:
         self._should_stop_on_los = value
@@ -59,7 +179,7 @@ class PortStruct:
 
     @property
     def capabilities(self) -> "commands.P_CAPABILITIES.GetDataAttr":
-        return self.port_ins.info.capabilities
+        return self._capabilities
 
     async def _change_sync_status(
         self,
@@ -87,7 +207,18 @@ class PortStruct:
         get_attr: "commands.P_TRAFFIC.GetDataAttr",
     ) -> None:
         """ update traffic_status if it changes """
-        self.properties.traffic_status = bool(get_attr.on_off)
+        self._set_traffic_status(bool(get_attr.on_off))
+
+    def _set_traffic_status(self, traffic_status: bool) -> None:
+        self.properties.traffic_status = traffic_status
+        if traffic_status:
+            self._traffic_stopped.clear()
+        else:
+            self._traffic_stopped.set()
+
+    async def wait_traffic_stopped(self) -> None:
+        """ return once the traffic status notification reports the traffic is off """
+        await self._traffic_stopped.wait()
 
     async def __on_reservation_status(
         self, port: "xoa_ports.GenericL23Port", get_attr: "commands.P_RESERVATION.GetDataAttr"
@@ -116,106 +247,116 @@ class PortStruct:
     async def set_toggle_port_sync(self, state: enums.OnOff) -> None:
         await self.port_ins.tx_config.enable.set(state)
 
-    async def set_broadr_reach_mode(self, broadr_reach_mode: const.BRRModeStr) -> None:
-        if self.port_ins.info.is_brr_mode_supported == enums.YesNo.NO:
+    def set_broadr_reach_mode(
+        self, broadr_reach_mode: const.BRRModeStr
+    ) -> Optional["misc.Token"]:
+        if not self._can_brr_mode:
             self._xoa_out.send_warning(
                 exceptions.BroadReachModeNotSupport(self._port_identity.name)
             )
         elif isinstance(self.port_ins, const.BrrPorts):
-            await self.port_ins.brr_mode.set(broadr_reach_mode.to_xmp())
+            return self.port_ins.brr_mode.set(broadr_reach_mode.to_xmp())
+        return None
 
-    async def set_mdi_mdix_mode(self, mdi_mdix_mode: const.MdiMdixMode) -> None:
-        if self.port_ins.info.capabilities.can_mdi_mdix == enums.YesNo.NO:
+    def set_mdi_mdix_mode(
+        self, mdi_mdix_mode: const.MdiMdixMode
+    ) -> Optional["misc.Token"]:
+        if not self._can_mdi_mdix:
             self._xoa_out.send_warning(
                 exceptions.MdiMdixModeNotSupport(self._port_identity.name)
             )
         elif isinstance(self.port_ins, const.MdixPorts):
-            await self.port_ins.mdix_mode.set(mdi_mdix_mode.to_xmp())
+            return self.port_ins.mdix_mode.set(mdi_mdix_mode.to_xmp())
+        return None
 
-    async def set_anlt(self, on_off: bool) -> None:
+    def set_anlt(self, on_off: bool) -> List["misc.Token"]:
         """Thor-400G-7S-1P support ANLT feature"""
+        tokens: List["misc.Token"] = []
         if not on_off or not isinstance(self.port_ins, const.PCSPMAPorts):
-            return
+            return tokens
 
-        if bool(self.port_ins.info.capabilities.can_auto_neg_base_r):
-            await self.port_ins.pcs_pma.auto_neg.settings.set(
+        if self._can_auto_neg_base_r:
+            tokens.append(self.port_ins.pcs_pma.auto_neg.settings.set(
                 enums.AutoNegMode.ANEG_ON,
                 enums.AutoNegTecAbility.DEFAULT_TECH_MODE,
                 enums.AutoNegFECOption.DEFAULT_FEC,
                 enums.AutoNegFECOption.DEFAULT_FEC,
                 enums.PauseMode.NO_PAUSE,
-            )
+            ))
         else:
             self._xoa_out.send_warning(
                 exceptions.ANLTNotSupport(self._port_identity.name)
             )
-        if bool(self.port_ins.info.capabilities.can_set_link_train):
-            await self.port_ins.pcs_pma.link_training.settings.set(
+        if self._can_set_link_train:
+            tokens.append(self.port_ins.pcs_pma.link_training.settings.set(
                 enums.LinkTrainingMode.FORCE_ENABLE,
                 enums.PAM4FrameSize.N16K_FRAME,
                 enums.LinkTrainingInitCondition.NO_INIT,
                 enums.NRZPreset.NRZ_NO_PRESET,
                 enums.TimeoutMode.DEFAULT_TIMEOUT,
-            )
+            ))
         else:
             self._xoa_out.send_warning(
                 exceptions.ANLTNotSupport(self._port_identity.name)
             )
+        return tokens
 
-    async def set_auto_negotiation(self, on_off: bool) -> None:
+    def set_auto_negotiation(self, on_off: bool) -> Optional["misc.Token"]:
         """P_AUTONEGSELECTION"""
         if not on_off:
-            return
-        if not bool(self.port_ins.info.capabilities.can_set_autoneg):
+            return None
+        if not self._can_set_autoneg:
             self._xoa_out.send_warning(
                 exceptions.AutoNegotiationNotSupport(self._port_identity.name)
             )
         elif isinstance(self.port_ins, const.AutoNegPorts):
-            await self.port_ins.autoneg_selection.set_on()  # type:ignore
+            return self.port_ins.autoneg_selection.set_on()  # type:ignore
+        return None
 
-    async def set_speed_mode(self, port_speed_mode: const.PortSpeedStr) -> None:
+    def set_speed_mode(
+        self, port_speed_mode: const.PortSpeedStr
+    ) -> Optional["misc.Token"]:
         mode = port_speed_mode.to_xmp()
         if mode not in self.port_ins.info.port_possible_speed_modes:
             self._xoa_out.send_warning(exceptions.PortSpeedWarning(mode))
-        else:
-            await self.port_ins.speed.mode.selection.set(mode)
+            return None
+        return self.port_ins.speed.mode.selection.set(mode)
 
-    async def set_sweep_reduction(self, ppm: int) -> None:
-        await self.port_ins.speed.reduction.set(ppm=ppm)
+    def set_sweep_reduction(self, ppm: int) -> "misc.Token":
+        return self.port_ins.speed.reduction.set(ppm=ppm)
 
-    async def set_stagger_step(self, port_stagger_steps: int) -> None:
+    def set_stagger_step(self, port_stagger_steps: int) -> Optional["misc.Token"]:
         if not port_stagger_steps:
-            return
-        await self.port_ins.tx_config.delay.set(port_stagger_steps)  # P_TXDELAY
+            return None
+        return self.port_ins.tx_config.delay.set(port_stagger_steps)  # P_TXDELAY
 
-    async def set_fec_mode(self, fec_mode: const.FECModeStr) -> None:
+    def set_fec_mode(self, fec_mode: const.FECModeStr) -> Optional["misc.Token"]:
         """Loki-100G-5S-2P  module 4 * 25G support FC_FEC mode"""
         if fec_mode == const.FECModeStr.OFF:
-            return
-        await self.port_ins.fec_mode.set(fec_mode.to_xmp())  # PP_FECMODE
+            return None
+        return self.port_ins.fec_mode.set(fec_mode.to_xmp())  # PP_FECMODE
 
-    async def set_max_header(self, header_length: int) -> None:
-        # calculate max header length
-        for p in const.STANDARD_SEGMENT_VALUE:
-            if header_length <= p:
-                header_length = p
-                break
-        await self.port_ins.max_header_length.set(header_length)
+    def set_max_header(self, header_length: int) -> "misc.Token":
+        # calculate max header length, STANDARD_SEGMENT_VALUE is sorted ascending
+        index = bisect_left(const.STANDARD_SEGMENT_VALUE, header_length)
+        if index < len(const.STANDARD_SEGMENT_VALUE):
+            header_length = const.STANDARD_SEGMENT_VALUE[index]
+        return self.port_ins.max_header_length.set(header_length)
 
-    async def set_packet_size_if_mix(self, frame_sizes: "FrameSize") -> None:
+    def set_packet_size_if_mix(self, frame_sizes: "FrameSize") -> List["misc.Token"]:
         if not frame_sizes.packet_size_type.is_mix:
-            return
-        await self.port_ins.mix.weights.set(*frame_sizes.mixed_sizes_weights)
+            return []
+        tokens = [self.port_ins.mix.weights.set(*frame_sizes.mixed_sizes_weights)]
         if frame_sizes.mixed_length_config:
             dic = frame_sizes.mixed_length_config.dict()
-
-            for k, v in dic.items():
-                position = int(k.split("_")[-1])
-                # logger.debug(f"position: {position} value: {v}")
-                await self.port_ins.mix.lengths[position].set(v)
+            lengths = self.port_ins.mix.lengths
+            tokens.extend(
+                lengths[int(k.rsplit("_", 1)[-1])].set(v) for k, v in dic.items()
+            )
+        return tokens
 
     def send_packet(self, packet: str) -> "misc.Token":
-        return self.port_ins.tx_single_pkt.send.set(packet)
+        return self._send_packet(packet)
 
     def free(self, stop_test=False) -> "misc.Token":
         self.stop = stop_test
@@ -225,7 +366,7 @@ class PortStruct:
 
         tokens = [
             self.port_ins.sync_status.get(),
-            self.port_ins.traffic.state.get(),
+            self._get_traffic_state(),
             self.port_ins.net_config.mac_address.get(),
             self.port_ins.speed.current.get(),
         ]
@@ -238,20 +379,21 @@ class PortStruct:
         tokens.append(self.port_ins.reset.set())
 
         (sync, traffic, mac, port_speed, *_) = await driver_utils.apply(*tokens)
+        self._snapshot_capabilities()
         self.port_ins.on_reservation_change(self.__on_reservation_status)
         self.port_ins.on_receive_sync_change(self._change_sync_status)
         self.port_ins.on_traffic_change(self._change_traffic_status)
         self.port_ins.on_speed_change(self._change_physical_port_speed)
         self._tester.on_disconnected(self.__on_disconnect_tester)
         self.properties.sync_status = bool(sync.sync_status)
-        self.properties.traffic_status = bool(traffic.on_off)
+        self._set_traffic_status(bool(traffic.on_off))
         self.properties.native_mac_address = MacAddress(mac.mac_address)
         self.properties.physical_port_speed = port_speed.port_speed * 1e6
 
     async def clear_statistic(self) -> None:
         await driver_utils.apply(
-            self.port_ins.statistics.tx.clear.set(),
-            self.port_ins.statistics.rx.clear.set(),
+            self._clear_tx_statistics(),
+            self._clear_rx_statistics(),
         )
 
     async def set_tx_time_limit(self, tx_timelimit: int) -> None:
@@ -265,66 +407,56 @@ class PortStruct:
         )
 
     def set_traffic(self, traffic_state: "enums.StartOrStop") -> "misc.Token":
-        return self.port_ins.traffic.state.set(traffic_state)
-
-    async def set_arp_trucks(self, arp_datas: Set["RXTableData"]) -> None:
-        arp_chunk: List["misc.ArpChunk"] = []
-        for arp_data in arp_datas:
-            arp_chunk.append(
-                misc.ArpChunk(
-                    arp_data.destination_ip,
-                    const.IPPrefixLength.IPv4.value,
-                    enums.OnOff.OFF,
-                    arp_data.dmac,
-                )
-            )
-        await self.port_ins.arp_rx_table.set(arp_chunk)
-
-    async def set_ndp_trucks(self, ndp_datas: Set["RXTableData"]) -> None:
-        ndp_chunk: List["misc.NdpChunk"] = []
-        for rx_data in ndp_datas:
-            ndp_chunk.append(
-                misc.NdpChunk(
-                    rx_data.destination_ip,
-                    const.IPPrefixLength.IPv6.value,
-                    enums.OnOff.OFF,
-                    rx_data.dmac,
-                )
-            )
-        await self.port_ins.ndp_rx_table.set(ndp_chunk)
+        return self._set_traffic_state(traffic_state)
 
-    async def set_reply(self) -> None:
-        await driver_utils.apply(
+    def set_arp_trucks(self, arp_datas: Iterable["RXTableData"]) -> "misc.Token":
+        prefix = const.IPPrefixLength.IPv4.value
+        arp_chunk = [
+            misc.ArpChunk(arp_data.destination_ip, prefix, _OFF, arp_data.dmac)
+            for arp_data in arp_datas
+        ]
+        return self.port_ins.arp_rx_table.set(arp_chunk)
+
+    def set_ndp_trucks(self, ndp_datas: Iterable["RXTableData"]) -> "misc.Token":
+        prefix = const.IPPrefixLength.IPv6.value
+        ndp_chunk = [
+            misc.NdpChunk(rx_data.destination_ip, prefix, _OFF, rx_data.dmac)
+            for rx_data in ndp_datas
+        ]
+        return self.port_ins.ndp_rx_table.set(ndp_chunk)
+
+    def set_reply(self) -> List["misc.Token"]:
+        return [
             self.port_ins.net_config.ipv4.arp_reply.set_on(),  # P_ARPREPLY
             self.port_ins.net_config.ipv6.arp_reply.set_on(),  # P_ARPV6REPLY
             self.port_ins.net_config.ipv4.ping_reply.set_on(),  # P_PINGREPLY
             self.port_ins.net_config.ipv6.ping_reply.set_on(),  # P_PINGV6REPLY
-        )
+        ]
 
     async def set_tpld_mode(self, use_micro_tpld: bool) -> None:
-        await self.port_ins.tpld_mode.set(enums.TPLDMode(int(use_micro_tpld)))
+        await self.port_ins.tpld_mode.set(_MICRO_TPLD if use_micro_tpld else _NORMAL_TPLD)
 
-    async def set_latency_offset(self, offset: int) -> None:
-        await self.port_ins.latency_config.offset.set(offset=offset)
+    def set_latency_offset(self, offset: int) -> "misc.Token":
+        return self.port_ins.latency_config.offset.set(offset=offset)
 
-    async def set_interframe_gap(self, interframe_gap: int) -> None:
-        await self.port_ins.interframe_gap.set(min_byte_count=interframe_gap)
+    def set_interframe_gap(self, interframe_gap: int) -> "misc.Token":
+        return self.port_ins.interframe_gap.set(min_byte_count=interframe_gap)
 
-    async def set_pause_mode(self, pause_mode_enabled: bool):
-        await self.port_ins.pause.set(on_off=enums.OnOff(int(pause_mode_enabled)))
+    def set_pause_mode(self, pause_mode_enabled: bool) -> "misc.Token":
+        return self.port_ins.pause.set(on_off=_ON if pause_mode_enabled else _OFF)
 
-    async def set_latency_mode(self, latency_mode: "const.LatencyModeStr"):
-        await self.port_ins.latency_config.mode.set(latency_mode.to_xmp())
+    def set_latency_mode(self, latency_mode: "const.LatencyModeStr") -> "misc.Token":
+        return self.port_ins.latency_config.mode.set(latency_mode.to_xmp())
 
-    async def set_ip_address(self) -> None:
+    def set_ip_address(self) -> Optional["misc.Token"]:
         ip_properties = self._port_conf.ip_address
         if not ip_properties:
-            return
+            return None
         if isinstance(ip_properties.address, IPv4Address) and isinstance(
             ip_properties.gateway, IPv4Address
         ):
             subnet_mask = ip_properties.routing_prefix.to_ipv4()
-            await self.port_ins.net_config.ipv4.address.set(
+            return self.port_ins.net_config.ipv4.address.set(
                 ipv4_address=ip_properties.address,
                 subnet_mask=subnet_mask,
                 gateway=ip_properties.gateway,
@@ -333,16 +465,17 @@ class PortStruct:
         elif isinstance(ip_properties.address, IPv6Address) and isinstance(
             ip_properties.gateway, IPv6Address
         ):
-            await self.port_ins.net_config.ipv6.address.set(
+            return self.port_ins.net_config.ipv6.address.set(
                 ipv6_address=ip_properties.address,
                 gateway=ip_properties.gateway,
                 subnet_prefix=ip_properties.routing_prefix,
                 wildcard_prefix=128,
             )
+        return None
 
-    async def set_mac_address(self, mac_addr: str) -> None:
-        await self.port_ins.net_config.mac_address.set(mac_addr)
+    def set_mac_address(self, mac_addr: str) -> "misc.Token":
         self.properties.native_mac_address = MacAddress(mac_addr)
+        return self.port_ins.net_config.mac_address.set(mac_addr)
 
     @property
     def local_states(self):
@@ -356,7 +489,7 @@ class PortStruct:
         return await self.port_ins.streams.create()
 
     async def get_traffic_status(self) -> bool:
-        return bool((await self.port_ins.traffic.state.get()).on_off)
+        return bool((await self._get_traffic_state()).on_off)
 
     @property
     def send_port_speed(self) -> float:
@@ -422,8 +555,10 @@ class PortStruct:
             for field_value_range in header_segment.value_ranges:
                 if field_value_range.restart_for_each_port:
                     field_value_range.reset()
-        for stream_struct in self._stream_structs:
-            await stream_struct.configure(test_conf)
+        # streams configure their own copy of the profile, the driver creates stream indices in call order
+        await asyncio.gather(
+            *[stream_struct.configure(test_conf) for stream_struct in self._stream_structs]
+        )
 
     async def set_streams_packet_size(
         self, packet_size_type: "enums.LengthType", min_size: int, max_size: int
@@ -435,36 +570,46 @@ class PortStruct:
             ]
         )
 
-    async def setup_port(
-        self, test_conf: "TestConfigData", latency_mode: "const.LatencyModeStr"
+    def add_setup_commands(
+        self,
+        batch: "PortSetupBatch",
+        test_conf: "TestConfigData",
+        latency_mode: "const.LatencyModeStr",
     ) -> None:
+        """ add the port setup commands to batch in their original order, nothing is sent """
         if not test_conf.is_stream_based:
             mac = gen_macaddress(
                 test_conf.mac_base_address,
                 self.properties.test_port_index,
             )
-            await self.set_mac_address(str(mac))
-        await self.set_speed_mode(self._port_conf.port_speed_mode)
-        await self.set_latency_offset(self._port_conf.latency_offset_ms)
-        await self.set_interframe_gap(int(self._port_conf.inter_frame_gap))
-        await self.set_pause_mode(self._port_conf.pause_mode_enabled)
-        await self.set_latency_mode(latency_mode)
-        await self.set_reply()
-        await self.set_ip_address()
-        await self.set_broadr_reach_mode(self._port_conf.broadr_reach_mode)
-        await self.set_mdi_mdix_mode(self._port_conf.mdi_mdix_mode)
-        await self.set_fec_mode(self._port_conf.fec_mode)
-        await self.set_anlt(self._port_conf.anlt_enabled)
-        await self.set_auto_negotiation(self._port_conf.auto_neg_enabled)
-        await self.set_max_header(self._port_conf.profile.packet_header_length)
-        await self.set_sweep_reduction(self._port_conf.speed_reduction_ppm)
-        await self.set_stagger_step(test_conf.port_stagger_steps)
-        await self.set_packet_size_if_mix(test_conf.frame_sizes)
+            batch.add(self.set_mac_address(str(mac)))
+        for step in self._setup_plan_head:
+            batch.add(step())
+        batch.add(self.set_latency_mode(latency_mode))
+        for step in self._setup_plan_tail:
+            batch.add(step())
+        batch.add(self.set_stagger_step(test_conf.port_stagger_steps))
+        batch.add(self.set_packet_size_if_mix(test_conf.frame_sizes))
+
+    async def setup_port(
+        self,
+        test_conf: "TestConfigData",
+        latency_mode: "const.LatencyModeStr",
+        sweep_reduction_ppm: Optional[int] = None,
+    ) -> None:
+        batch = PortSetupBatch()
+        self.add_setup_commands(batch, test_conf, latency_mode)
+        if sweep_reduction_ppm is not None:
+            # overrides the speed reduction of the port config, so it must come after it
+            batch.add(self.set_sweep_reduction(sweep_reduction_ppm))
+        await batch.flush()
         self._get_use_port_speed()
 
     async def set_rx_tables(self) -> None:
-        await self.set_arp_trucks(self.properties.arp_trunks)
-        await self.set_ndp_trucks(self.properties.ndp_trunks)
+        batch = PortSetupBatch()
+        batch.add(self.set_arp_trucks(self.properties.arp_trunks.values()))
+        batch.add(self.set_ndp_trucks(self.properties.ndp_trunks.values()))
+        await batch.flush()
 
     def get_capped_port_speed(self) -> float:
         """ compare physical port speed and custom port speed """
@@ -488,7 +633,7 @@ class PortStruct:
 
     async def query(self) -> None:
         """ read port statistics """
-        extra = self.port_ins.statistics.rx.extra.get()
+        extra = self._get_rx_extra()
         stream_tasks = [stream_struct.query() for stream_struct in self.stream_structs]
         extra_tasks = [extra] if self.port_conf.is_rx_port else []
         results = await asyncio.gather(*extra_tasks, *stream_tasks)
@@ -501,6 +646,8 @@ class PortStruct:
 
 
 TypeConf = Union["ThroughputTest", "LatencyTest", "FrameLossRateTest", "BackToBackTest"]
+SetupTokens = Union["misc.Token", List["misc.Token"], None]
+SetupStep = Callable[[], SetupTokens]
 
 
 @dataclass
@@ -514,8 +661,10 @@ class Properties:
     highest_dest_port_index: int = -1
     address_refresh_data_set: Set[ArpRefreshData] = field(default_factory=set)
     peers: List["PortStruct"] = field(default_factory=list)
-    arp_trunks: Set[RXTableData] = field(default_factory=set)
-    ndp_trunks: Set[RXTableData] = field(default_factory=set)
+    _peer_ids: Set[int] = field(default_factory=set, init=False, repr=False)
+    # rx table entries keyed by (destination_ip, dmac), in insertion order
+    arp_trunks: Dict[Tuple, RXTableData] = field(default_factory=dict)
+    ndp_trunks: Dict[Tuple, RXTableData] = field(default_factory=dict)
 
     rate_percent: float = 0.0
     send_port_speed: float = 0.0
@@ -551,26 +700,33 @@ class Properties:
 
         return modifier_range
 
+    def add_arp(self, entry: "RXTableData") -> None:
+        self.arp_trunks.setdefault((entry.destination_ip, entry.dmac), entry)
+
+    def add_ndp(self, entry: "RXTableData") -> None:
+        self.ndp_trunks.setdefault((entry.destination_ip, entry.dmac), entry)
+
+    def has_peer(self, peer: "PortStruct") -> bool:
+        return id(peer) in self._peer_ids
+
     def register_peer(self, peer: "PortStruct") -> None:
-        if peer not in self.peers:
+        if id(peer) not in self._peer_ids:
+            self._peer_ids.add(id(peer))
             self.peers.append(peer)
-        if peer.properties.test_port_index == self.test_port_index:
+        peer_index = peer.properties.test_port_index
+        if peer_index == self.test_port_index:
             return
         self.dest_port_count += 1
-        if peer.properties.test_port_index < self.test_port_index:
+        if peer_index < self.test_port_index:
             self.low_dest_port_count += 1
-        elif peer.properties.test_port_index > self.test_port_index:
+        else:
             self.high_dest_port_count += 1
         self.num_modifiersL2 = (
             2 if (self.low_dest_port_count > 0 and self.high_dest_port_count > 0) else 1
         )
-        self.lowest_dest_port_index = (
-            peer.properties.test_port_index
-            if self.lowest_dest_port_index == -1
-            else min(self.lowest_dest_port_index, peer.properties.test_port_index)
-        )
-        self.highest_dest_port_index = (
-            peer.properties.test_port_index
-            if self.highest_dest_port_index == -1
-            else max(self.highest_dest_port_index, peer.properties.test_port_index)
-        )
+        if self.dest_port_count == 1:
+            # first destination replaces the -1 defaults
+            self.lowest_dest_port_index = self.highest_dest_port_index = peer_index
+        else:
+            self.lowest_dest_port_index = min(self.lowest_dest_port_index, peer_index)
+            self.highest_dest_port_index = max(self.highest_dest_port_index, peer_index)
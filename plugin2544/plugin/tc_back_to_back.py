@@ -2,7 +2,6 @@ from .structure import PortStruct
 from typing import List, Optional
 from .test_type_config import BackToBackConfig
 from loguru import logger
-from decimal import Decimal
 from .statistics import FinalStatistic
 
 class BackToBackBoutEntry:
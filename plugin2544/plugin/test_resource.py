@@ -67,10 +67,19 @@ class ResourceManager:
         ]
 
     async def setup_ports(self, latency_mode: "const.LatencyModeStr") -> None:
+        # the sweep reduction is sent in the same batch as the rest of the port setup
+        use_sweep_reduction = (
+            self.__test_conf.enable_speed_reduction_sweep
+            and not self.__test_conf.is_pair_topology
+        )
         await asyncio.gather(
             *[
-                port_struct.setup_port(self.__test_conf, latency_mode)
-                for port_struct in self.port_structs
+                port_struct.setup_port(
+                    self.__test_conf,
+                    latency_mode,
+                    10 * (i + 1) if use_sweep_reduction else None,
+                )
+                for i, port_struct in enumerate(self.port_structs)
             ]
         )
 
@@ -95,7 +104,6 @@ class ResourceManager:
         await self.stop_traffic()
         await asyncio.sleep(self.__test_conf.delay_after_port_reset_second) # delay after reset
         await self.setup_ports(latency_mode)
-        await self.setup_sweep_reduction()
         await self.add_toggle_port_sync_state_steps()
         await setup_streams(self.port_structs, self.__test_conf)
         await add_mac_learning_steps(self, const.MACLearningMode.ONCE)
@@ -107,20 +115,19 @@ class ResourceManager:
                 for port_struct in self.port_structs
             ]
         )
-        await asyncio.sleep(const.DELAY_STOPPED_TRAFFIC)
-
-    async def setup_sweep_reduction(self) -> None:
-        if (
-            not self.__test_conf.enable_speed_reduction_sweep
-            or self.__test_conf.is_pair_topology
-        ):
-            return
-        await asyncio.gather(
-            *[
-                port.set_sweep_reduction(10 * (i + 1))
-                for i, port in enumerate(self.port_structs)
-            ]
-        )
+        # wait for the traffic off notifications, DELAY_STOPPED_TRAFFIC remains the upper bound
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *[
+                        port_struct.wait_traffic_stopped()
+                        for port_struct in self.port_structs
+                    ]
+                ),
+                const.DELAY_STOPPED_TRAFFIC,
+            )
+        except asyncio.TimeoutError:
+            pass
 
     async def collect_control_ports(self) -> None:
         await asyncio.gather(*self.__testers.values())
@@ -500,17 +500,23 @@ class PortProtocolVersion(CaseInsensitiveEnum):
     IPV4 = 4
     IPV6 = 6
 
+    def __init__(self, value: int) -> None:
+        # members are singletons, so resolve the flags once at class creation
+        self._is_ipv4 = value == 4
+        self._is_ipv6 = value == 6
+        self._is_l3 = value != 0
+
     @property
     def is_ipv4(self) -> bool:
-        return self == type(self).IPV4
+        return self._is_ipv4
 
     @property
     def is_ipv6(self) -> bool:
-        return self == type(self).IPV6
+        return self._is_ipv6
 
     @property
     def is_l3(self) -> bool:
-        return self != type(self).ETHERNET
+        return self._is_l3
 
 
 class IPVersion(CaseInsensitiveEnum):
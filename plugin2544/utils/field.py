@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Union, TYPE_CHECKING
 from ipaddress import (
     IPv4Address as OldIPv4Address,
@@ -16,6 +17,15 @@ def hex_string_to_binary_string(hex: str) -> "BinaryString":
     return BinaryString(bin(int("1" + hex, 16))[3:])
 
 
+@lru_cache(maxsize=1024)
+def network_for(
+    address: Union[OldIPv4Address, OldIPv6Address], prefix: int
+) -> Union[IPv4Network, IPv6Network]:
+    """networks are immutable, so ports with the same address and prefix share one"""
+    network_type = IPv6Network if isinstance(address, OldIPv6Address) else IPv4Network
+    return network_type((int(address), prefix), strict=False)
+
+
 class HexString(str):
     def to_list(self) -> List[str]:
         return [i for i in re.findall(r".{2}", self)]
@@ -83,7 +93,7 @@ class IPv4Address(OldIPv4Address):
         return bytearray(self.packed)
 
     def network(self, prefix: int) -> IPv4Network:
-        return IPv4Network(f"{self}/{prefix}", strict=False)
+        return network_for(self, int(prefix))  # type: ignore
 
     @property
     def is_empty(self) -> bool:
@@ -108,7 +118,7 @@ class IPv6Address(OldIPv6Address):
         return not self or self == IPv6Address("::")
 
     def network(self, prefix: int) -> IPv6Network:
-        return IPv6Network(f"{self}/{prefix}", strict=False)
+        return network_for(self, int(prefix))  # type: ignore
 
     def to_binary_string(self) -> "BinaryString":
         return hex_string_to_binary_string(self.to_hexstring())